@@ -4,7 +4,12 @@ Flask Web Application for Minecraft Resource Pack Merger
 提供友好的用户界面来合并Minecraft资源包
 """
 from flask import Flask, render_template, request, send_file, jsonify, url_for
+import os
 import shutil
+import stat
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from werkzeug.utils import secure_filename
 from PIL import Image
@@ -12,7 +17,7 @@ from PIL import Image
 # Import merge functionality from merge_packs.py
 from merge_packs import (
     load_pack_info, Merger, is_valid_resource_pack,
-    extract_zip_pack
+    extract_zip_pack, write_zip, write_tar_zst, zstandard
 )
 
 app = Flask(__name__)
@@ -21,6 +26,40 @@ app.config['UPLOAD_FOLDER'] = Path('uploads')
 app.config['OUTPUT_FOLDER'] = Path('outputs')
 app.config['SECRET_KEY'] = 'your-secret-key-change-in-production'
 
+
+def private_scratch_dir(path: Path) -> Path:
+    """
+    Create path as a 0700 directory, or reuse it if it already is one owned by this user.
+    Raises OSError for symlinks, other users' directories and group/world-accessible modes,
+    so another local user can't pre-create or redirect the folder uploads are extracted to
+    """
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"unsafe scratch folder: {path}")
+    return path
+
+
+# Extracted packs go to RAM-backed tmpfs when available, so they don't compete for disk
+# writes with uploads and outputs; otherwise they stay next to the uploaded zips.
+# The folder name is stable per user, so every process (reloader, workers, restarts)
+# shares it and cleanup_old_files sweeps sessions a killed process left behind.
+app.config['SCRATCH_FOLDER'] = app.config['UPLOAD_FOLDER']
+if Path('/dev/shm').is_dir() and hasattr(os, 'getuid'):
+    try:
+        app.config['SCRATCH_FOLDER'] = private_scratch_dir(Path(f'/dev/shm/packmerger-{os.getuid()}'))
+    except OSError as e:
+        print(f"Not using /dev/shm for extraction: {e}")
+
+# Part of the scratch tmpfs that extractions must leave free (it is shared RAM)
+SCRATCH_HEADROOM_FRACTION = 0.1
+SCRATCH_MIN_HEADROOM = 64 * 1024 * 1024
+_scratch_lock = threading.Lock()
+_scratch_reserved = 0  # bytes claimed by extractions still in progress
+
 # Ensure folders exist
 app.config['UPLOAD_FOLDER'].mkdir(exist_ok=True)
 app.config['OUTPUT_FOLDER'].mkdir(exist_ok=True)
@@ -71,6 +110,15 @@ def process_custom_icon(image_file, output_path: Path):
         return False
 
 
+def stream_to_disk(file_storage, dest: Path, chunk_size: int = 1 << 20):
+    """
+    Write an uploaded file to dest in 1 MiB chunks
+    (FileStorage.save copies with a 16 KiB buffer)
+    """
+    with open(dest, 'wb') as fp:
+        shutil.copyfileobj(file_storage.stream, fp, chunk_size)
+
+
 def find_pack_in_directory(directory: Path, max_depth: int = 3) -> Path:
     """
     Find a valid resource pack in a directory, searching recursively if needed.
@@ -115,12 +163,86 @@ def cleanup_old_files(folder, max_age_hours=24):
                     print(f"Failed to delete {item}: {e}")
 
 
+def session_temp_dir(session_id: str):
+    """
+    Return the directory holding a session's extracted packs (scratch or upload folder),
+    or None if it doesn't exist
+    """
+    for root in (app.config['SCRATCH_FOLDER'], app.config['UPLOAD_FOLDER']):
+        temp_dir = root / session_id / 'temp'
+        if temp_dir.is_dir():
+            return temp_dir
+    return None
+
+
+def zip_uncompressed_size(zip_path: Path) -> int:
+    """Total extracted size of a zip, read from its central directory"""
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            return sum(info.file_size for info in zf.infolist())
+    except (zipfile.BadZipFile, OSError):
+        return 0
+
+
+def reserve_scratch(needed: int) -> bool:
+    """
+    Claim needed bytes of scratch space, keeping a safety margin free and counting the
+    claims of concurrent uploads; release with release_scratch once extraction is done
+    """
+    global _scratch_reserved
+    usage = shutil.disk_usage(app.config['SCRATCH_FOLDER'])
+    headroom = max(SCRATCH_MIN_HEADROOM, int(usage.total * SCRATCH_HEADROOM_FRACTION))
+    with _scratch_lock:
+        if usage.free - _scratch_reserved - headroom < needed:
+            return False
+        _scratch_reserved += needed
+        return True
+
+
+def release_scratch(amount: int):
+    global _scratch_reserved
+    with _scratch_lock:
+        _scratch_reserved -= amount
+
+
+def remove_scratch_session(session_id: str):
+    """Free a session's extracted packs from the scratch tmpfs (no-op without one)"""
+    if app.config['SCRATCH_FOLDER'] != app.config['UPLOAD_FOLDER']:
+        shutil.rmtree(app.config['SCRATCH_FOLDER'] / session_id, ignore_errors=True)
+
+
+def extract_uploads(session_id: str, zip_paths):
+    """
+    Extract and validate a session's uploaded zips, on the scratch tmpfs if they fit there.
+    Returns (temp_dir, list of extracted pack roots or None, one per zip)
+    """
+    temp_dir = app.config['UPLOAD_FOLDER'] / session_id / 'temp'
+    reserved = 0
+    if app.config['SCRATCH_FOLDER'] != app.config['UPLOAD_FOLDER']:
+        needed = sum(zip_uncompressed_size(p) for p in zip_paths)
+        if reserve_scratch(needed):
+            reserved = needed
+            temp_dir = app.config['SCRATCH_FOLDER'] / session_id / 'temp'
+    try:
+        temp_dir.mkdir(parents=True, exist_ok=True)
+        if not zip_paths:
+            return temp_dir, []
+        # Extract in parallel; zlib releases the GIL while inflating
+        with ThreadPoolExecutor(max_workers=min(8, len(zip_paths))) as executor:
+            return temp_dir, list(executor.map(lambda p: extract_zip_pack(p, temp_dir), zip_paths))
+    finally:
+        if reserved:
+            release_scratch(reserved)
+
+
 @app.route('/')
 def index():
     """主页 - 显示上传界面"""
     cleanup_old_files(app.config['UPLOAD_FOLDER'])
     cleanup_old_files(app.config['OUTPUT_FOLDER'])
-    return render_template('index.html')
+    if app.config['SCRATCH_FOLDER'] != app.config['UPLOAD_FOLDER']:
+        cleanup_old_files(app.config['SCRATCH_FOLDER'])
+    return render_template('index.html', tar_zst_available=zstandard is not None)
 
 
 @app.route('/upload', methods=['POST'])
@@ -140,29 +262,36 @@ def upload_files():
     session_dir.mkdir(exist_ok=True)
 
     uploaded_packs = []
-    temp_dir = session_dir / 'temp'
-    temp_dir.mkdir(exist_ok=True)
 
+    # Saving must stay sequential (request body is a single stream)
+    saved_zips = []
     for file in files:
         if file and allowed_file(file.filename):
             filename = secure_filename(file.filename)
             filepath = session_dir / filename
-            file.save(filepath)
+            stream_to_disk(file, filepath)
+            saved_zips.append(filepath)
 
-            # Extract and validate the pack
-            extracted = extract_zip_pack(filepath, temp_dir)
+    try:
+        temp_dir, extracted_list = extract_uploads(session_id, saved_zips)
+        for extracted in extracted_list:
             if extracted:
                 pack_info = load_pack_info(extracted)
                 uploaded_packs.append({
                     'name': pack_info.name,
-                    'path': str(extracted.relative_to(session_dir)),
+                    'path': str(extracted.relative_to(temp_dir.parent)),
                     'pack_format': pack_info.pack_format,
                     'description': pack_info.description,
                     'has_png': pack_info.has_pack_png
                 })
+    except Exception as e:
+        shutil.rmtree(session_dir, ignore_errors=True)
+        remove_scratch_session(session_id)
+        return jsonify({'error': f'解压失败: {str(e)}'}), 500
 
     if not uploaded_packs:
         shutil.rmtree(session_dir)
+        remove_scratch_session(session_id)
         return jsonify({'error': '没有找到有效的资源包'}), 400
 
     return jsonify({
@@ -198,6 +327,12 @@ def merge_packs():
     create_zip = data.get('create_zip', 'true')
     if isinstance(create_zip, str):
         create_zip = create_zip.lower() == 'true'
+    # Optional .tar.zst archive (multithreaded zstd); only offered when zstandard is installed
+    create_tar_zst = data.get('create_tar_zst', 'false')
+    if isinstance(create_tar_zst, str):
+        create_tar_zst = create_tar_zst.lower() == 'true'
+    if create_tar_zst and zstandard is None:
+        return jsonify({'error': '服务器未安装 zstandard，无法创建 .tar.zst 文件'}), 400
 
     if not session_id:
         return jsonify({'error': '无效的会话ID'}), 400
@@ -206,89 +341,106 @@ def merge_packs():
     if not session_dir.exists():
         return jsonify({'error': '会话不存在或已过期'}), 404
 
-    temp_dir = session_dir / 'temp'
-    if not temp_dir.exists():
-        return jsonify({'error': '没有找到上传的资源包'}), 404
-
-    # Detect all packs in temp directory (including nested ones)
-    detected_packs = []
-    for item in temp_dir.iterdir():
-        if item.is_dir():
-            pack_path = find_pack_in_directory(item)
-            if pack_path:
-                detected_packs.append(pack_path)
-
-    if not detected_packs:
-        return jsonify({'error': '没有找到有效的资源包'}), 400
-
-    # Order packs according to user preference
-    if pack_order:
-        pack_dict = {p.name: p for p in detected_packs}
-        ordered_packs = []
-        for name in pack_order:
-            if name in pack_dict:
-                ordered_packs.append(pack_dict[name])
-        # Add any packs not in the order list
-        for p in detected_packs:
-            if p not in ordered_packs:
-                ordered_packs.append(p)
-        pack_paths = ordered_packs
-    else:
-        pack_paths = sorted(detected_packs, key=lambda p: p.name.lower())
-
-    packs = [load_pack_info(p) for p in pack_paths]
-
-    # Create output directory
-    output_id = f"{session_id}_{output_name}"
-    output_dir = app.config['OUTPUT_FOLDER'] / output_id
-
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
-
+    temp_dir = session_temp_dir(session_id)
+    if temp_dir is None:
+        # The extracted copy is dropped from scratch after each merge; redo it from the
+        # uploaded zips so the session can be merged again
+        saved_zips = sorted(session_dir.glob('*.zip'))
+        if not saved_zips:
+            return jsonify({'error': '没有找到上传的资源包'}), 404
+        try:
+            temp_dir, _ = extract_uploads(session_id, saved_zips)
+        except Exception as e:
+            remove_scratch_session(session_id)
+            return jsonify({'error': f'解压失败: {str(e)}'}), 500
+
+    # Extracted packs in scratch are RAM; don't hold them until the 24h sweep
     try:
-        # Run merger
-        merger = Merger(
-            packs,
-            out_dir=output_dir,
-            dry_run=False,
-            clean=False,
-            exclude_patterns=[],
-            pack_format_override=pack_format,
-            description_override=description if description else None,
-        )
-        merger.run()
-
-        # Process custom icon if provided
-        if custom_icon_file and custom_icon_file.filename and allowed_image_file(custom_icon_file.filename):
-            custom_icon_path = output_dir / 'pack.png'
-            if process_custom_icon(custom_icon_file, custom_icon_path):
-                print(f"Successfully processed custom icon: {custom_icon_file.filename}")
-            else:
-                print(f"Failed to process custom icon, using default")
-
-        # Create zip if requested
-        zip_path = None
-        if create_zip:
-            zip_path = app.config['OUTPUT_FOLDER'] / f"{output_id}.zip"
-            if zip_path.exists():
-                zip_path.unlink()
-            shutil.make_archive(str(zip_path.with_suffix('')), 'zip', root_dir=output_dir)
-
-        return jsonify({
-            'success': True,
-            'output_id': output_id,
-            'stats': {
-                'copied': merger.stats.copied,
-                'overwritten': merger.stats.overwritten,
-                'merged_json': merger.stats.merged_json,
-                'skipped': merger.stats.skipped,
-                'errors': merger.stats.errors
-            },
-            'download_url': url_for('download', output_id=output_id) if create_zip else None
-        })
-
-    except Exception as e:
-        return jsonify({'error': f'合并失败: {str(e)}'}), 500
+        # Detect all packs in temp directory (including nested ones)
+        detected_packs = []
+        for item in temp_dir.iterdir():
+            if item.is_dir():
+                pack_path = find_pack_in_directory(item)
+                if pack_path:
+                    detected_packs.append(pack_path)
+
+        if not detected_packs:
+            return jsonify({'error': '没有找到有效的资源包'}), 400
+
+        # Order packs according to user preference
+        if pack_order:
+            pack_dict = {p.name: p for p in detected_packs}
+            ordered_packs = []
+            for name in pack_order:
+                if name in pack_dict:
+                    ordered_packs.append(pack_dict[name])
+            # Add any packs not in the order list
+            for p in detected_packs:
+                if p not in ordered_packs:
+                    ordered_packs.append(p)
+            pack_paths = ordered_packs
+        else:
+            pack_paths = sorted(detected_packs, key=lambda p: p.name.lower())
+
+        packs = [load_pack_info(p) for p in pack_paths]
+
+        # Create output directory
+        output_id = f"{session_id}_{output_name}"
+        output_dir = app.config['OUTPUT_FOLDER'] / output_id
+
+        if output_dir.exists():
+            shutil.rmtree(output_dir)
+
+        try:
+            # Run merger
+            merger = Merger(
+                packs,
+                out_dir=output_dir,
+                dry_run=False,
+                clean=False,
+                exclude_patterns=[],
+                pack_format_override=pack_format,
+                description_override=description if description else None,
+            )
+            merger.run()
+
+            # Process custom icon if provided
+            if custom_icon_file and custom_icon_file.filename and allowed_image_file(custom_icon_file.filename):
+                custom_icon_path = output_dir / 'pack.png'
+                if process_custom_icon(custom_icon_file, custom_icon_path):
+                    print(f"Successfully processed custom icon: {custom_icon_file.filename}")
+                else:
+                    print(f"Failed to process custom icon, using default")
+
+            # Create zip if requested
+            zip_path = None
+            if create_zip:
+                zip_path = app.config['OUTPUT_FOLDER'] / f"{output_id}.zip"
+                if zip_path.exists():
+                    zip_path.unlink()
+                write_zip(output_dir, zip_path)
+
+            if create_tar_zst:
+                write_tar_zst(output_dir, app.config['OUTPUT_FOLDER'] / f"{output_id}.tar.zst")
+
+            return jsonify({
+                'success': True,
+                'output_id': output_id,
+                'stats': {
+                    'copied': merger.stats.copied,
+                    'overwritten': merger.stats.overwritten,
+                    'merged_json': merger.stats.merged_json,
+                    'skipped': merger.stats.skipped,
+                    'errors': merger.stats.errors
+                },
+                'download_url': url_for('download', output_id=output_id) if create_zip else None,
+                'tar_zst_url': url_for('download_tar_zst', output_id=output_id) if create_tar_zst else None
+            })
+
+        except Exception as e:
+            return jsonify({'error': f'合并失败: {str(e)}'}), 500
+    finally:
+        remove_scratch_session(session_id)
 
 
 @app.route('/download/<output_id>')
@@ -306,6 +458,21 @@ def download(output_id):
     )
 
 
+@app.route('/download-zst/<output_id>')
+def download_tar_zst(output_id):
+    """下载 .tar.zst 格式的合并结果"""
+    tar_path = app.config['OUTPUT_FOLDER'] / f"{output_id}.tar.zst"
+    if not tar_path.exists():
+        return "文件不存在", 404
+
+    return send_file(
+        tar_path,
+        as_attachment=True,
+        download_name=f"{output_id}.tar.zst",
+        mimetype='application/zstd'
+    )
+
+
 if __name__ == '__main__':
     print("=" * 60)
     print("Minecraft 资源包合并器 Web 应用")
@@ -27,17 +27,47 @@ You can also run without --packs to autodetect all resource pack folders.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
+import os
+import re
 import shutil
 import sys
+import tarfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Union
 from fnmatch import fnmatch
 
+try:
+    import fcntl  # POSIX only; used for reflink copies on Linux
+except ImportError:
+    fcntl = None
+
+try:
+    import orjson  # optional, much faster JSON encode/decode
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard  # optional, only needed for .tar.zst output
+except ImportError:
+    zstandard = None
+
 
 DEFAULT_EXCLUDES = {".DS_Store", "Thumbs.db", "desktop.ini"}
+# Already-compressed formats; deflating them again costs CPU for no size gain
+STORED_SUFFIXES = {".png", ".ogg", ".jpg", ".jpeg", ".webp", ".mp3"}
+# orjson decodes integers wider than 64 bits as floats; a run of 20+ digits (2**64 has 20)
+# sends the document to the exact stdlib parser instead
+_WIDE_INT = re.compile(rb"\d{20}")
+# Without copy_file_range, files larger than this are copied with os.sendfile on Linux
+SENDFILE_THRESHOLD = 1 << 20
+# ioctl FICLONE from linux/fs.h (exposed as fcntl.FICLONE only on newer Pythons)
+_FICLONE = getattr(fcntl, "FICLONE", 0x40049409)
 
 
 @dataclass
@@ -52,47 +82,83 @@ class PackInfo:
 
 def is_valid_resource_pack(path: Path) -> bool:
     """Check if a directory is a valid Minecraft resource pack."""
-    if not path.is_dir():
-        return False
     # Must have pack.mcmeta to be a valid resource pack
     meta_path = path / "pack.mcmeta"
-    if not meta_path.exists():
-        return False
-    # Try to read it to ensure it's valid JSON
     try:
-        with meta_path.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            # Should have pack.pack_format at minimum
-            if isinstance(data, dict) and "pack" in data:
-                return True
-    except (json.JSONDecodeError, OSError):
-        pass
-    return False
+        data = _read_json_cached(str(meta_path), meta_path.stat().st_mtime_ns)
+    except OSError:
+        return False
+    # Should be valid JSON with pack.pack_format at minimum
+    return isinstance(data, dict) and "pack" in data
+
+
+def _zip_member_parts(name: str) -> List[str]:
+    """Path parts a zip member is extracted to, sanitized like ZipFile.extract (no absolute paths or '..')."""
+    return [p for p in name.replace("\\", "/").split("/") if p not in ("", ".", "..")]
+
+
+def _find_zip_pack_root(zf: zipfile.ZipFile, names: List[str], max_depth: int = 3) -> Optional[str]:
+    """
+    Return the member prefix ('' for the archive root) of the shallowest valid pack.mcmeta,
+    searching up to max_depth folders deep. The mcmeta is validated straight from the archive.
+    Depth is measured on the sanitized path, i.e. where the member would actually be extracted.
+    """
+    candidates = [n for n in names if n == "pack.mcmeta" or n.endswith("/pack.mcmeta")]
+    depths = {n: len(_zip_member_parts(n)) - 1 for n in candidates}
+    candidates.sort(key=depths.__getitem__)
+    for name in candidates:
+        if depths[name] > max_depth:
+            break
+        try:
+            data = json.loads(zf.read(name).decode("utf-8"))
+        except (ValueError, OSError, zipfile.BadZipFile):
+            continue
+        if isinstance(data, dict) and "pack" in data:
+            return name[:-len("pack.mcmeta")]
+    return None
+
+
+def _is_zip_cruft(name: str) -> bool:
+    """Archive entries that never belong in a pack (OS metadata, VCS folders)."""
+    parts = name.split("/")
+    return "__MACOSX" in parts or ".git" in parts or parts[-1] in DEFAULT_EXCLUDES
 
 
 def extract_zip_pack(zip_path: Path, temp_dir: Path) -> Optional[Path]:
-    """Extract a zip file to a temporary directory if it's a valid resource pack."""
+    """Extract a zip file to a temporary directory if it's a valid resource pack.
+
+    Only the subtree of the pack root is extracted, skipping OS/VCS cruft; zips without
+    a valid pack.mcmeta are rejected before anything is written to disk.
+    """
     try:
         extract_path = temp_dir / zip_path.stem
         with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(extract_path)
-        # Check if it's valid at root
-        if is_valid_resource_pack(extract_path):
-            return extract_path
-        # Sometimes the pack is nested in a subfolder - search recursively up to 3 levels deep
-        def find_pack_recursive(base: Path, max_depth: int = 3, current_depth: int = 0) -> Optional[Path]:
-            if current_depth >= max_depth:
+            infos = zf.infolist()
+            prefix = _find_zip_pack_root(zf, [info.filename for info in infos])
+            if prefix is None:
                 return None
-            for child in base.iterdir():
-                if child.is_dir():
-                    if is_valid_resource_pack(child):
-                        return child
-                    # Recurse into subdirectory
-                    found = find_pack_recursive(child, max_depth, current_depth + 1)
-                    if found:
-                        return found
-            return None
-        return find_pack_recursive(extract_path)
+            # Members are matched and placed by their sanitized parts, so '/pack.mcmeta'
+            # and 'assets/...' land in the same tree
+            prefix_parts = _zip_member_parts(prefix)
+            depth = len(prefix_parts)
+            root = str(extract_path)
+            made_dirs = set()
+            for info in infos:
+                name = info.filename
+                parts = _zip_member_parts(name)
+                if not parts or parts[:depth] != prefix_parts or _is_zip_cruft(name.rstrip("/")):
+                    continue
+                dest = os.path.join(root, *parts)
+                parent = dest if info.is_dir() else os.path.dirname(dest)
+                if parent not in made_dirs:
+                    os.makedirs(parent, exist_ok=True)
+                    made_dirs.add(parent)
+                if info.is_dir():
+                    continue
+                with zf.open(info) as src, open(dest, "wb") as dst:
+                    shutil.copyfileobj(src, dst, length=1 << 20)
+        # The root is built from the sanitized prefix as well, so it always lies inside extract_path
+        return extract_path.joinpath(*prefix_parts)
     except (zipfile.BadZipFile, OSError) as e:
         sys.stderr.write(f"WARNING: Failed to extract {zip_path}: {e}\n")
     return None
@@ -124,29 +190,128 @@ def detect_packs(base: Path, temp_dir: Optional[Path] = None) -> List[Path]:
     return found
 
 
-def read_json(path: Path) -> Optional[Any]:
+def read_json(path: Union[str, Path]) -> Optional[Any]:
     try:
-        with path.open("r", encoding="utf-8") as f:
+        if orjson is not None:
+            with open(path, "rb") as f:
+                raw = f.read()
+            if not _WIDE_INT.search(raw):
+                return orjson.loads(raw)
+            return json.loads(raw)
+        with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except FileNotFoundError:
         return None
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:  # orjson.JSONDecodeError is a subclass
         sys.stderr.write(f"WARNING: Failed to parse JSON {path}: {e}\n")
         return None
 
 
-def write_json(path: Path, data: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as f:
+@functools.lru_cache(maxsize=1024)
+def _read_json_cached(path_str: str, mtime_ns: int) -> Optional[Any]:
+    """
+    read_json memoized by (path, mtime); used for pack.mcmeta, which is read repeatedly
+    while detecting, validating and loading packs. Callers must not mutate the result.
+    """
+    return read_json(path_str)
+
+
+def write_json(path: Union[str, Path], data: Any) -> None:
+    # The parent directory must already exist
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            encoded = None  # e.g. integers beyond 64 bits; let the stdlib handle it
+        if encoded is not None:
+            with open(path, "wb") as f:
+                f.write(encoded)
+            return
+    with open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
         f.write("\n")
 
 
+def _fast_copy(src: str, dst: str, sendfile_threshold: int = SENDFILE_THRESHOLD) -> None:
+    """
+    Copy file contents only (no stat/chmod/utime like shutil.copy2).
+    Tries a reflink clone (btrfs/XFS), then in-kernel copy_file_range (which can also offload
+    to the server or filesystem), then sendfile for files above sendfile_threshold where
+    copy_file_range is unavailable or fails, then a buffered copy.
+    """
+    on_linux = sys.platform.startswith("linux")
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        if fcntl is not None and on_linux:
+            try:
+                fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+                return
+            except OSError:
+                pass
+        if hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(src_fd, dst_fd, 1 << 30):
+                    pass
+                return
+            except OSError:
+                # e.g. EXDEV on older kernels; start over with one of the fallbacks
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        if on_linux and hasattr(os, "sendfile"):
+            size = os.fstat(src_fd).st_size
+            if size > sendfile_threshold:
+                try:
+                    offset = 0
+                    while offset < size:
+                        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if not sent:
+                            break
+                        offset += sent
+                    return
+                except OSError:
+                    fdst.seek(0)
+                    fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+
+
+def write_zip(src_dir: Path, zip_path: Path) -> None:
+    """
+    Zip the contents of src_dir into zip_path.
+    Already-compressed media is stored as-is; text files are deflated at level 1.
+    """
+    with zipfile.ZipFile(zip_path, 'w', allowZip64=True) as zf:
+        for root, dirs, files in os.walk(src_dir):
+            dirs.sort()
+            for name in sorted(files):
+                full_path = os.path.join(root, name)
+                arcname = os.path.relpath(full_path, src_dir)
+                if os.path.splitext(name)[1].lower() in STORED_SUFFIXES:
+                    zf.write(full_path, arcname, compress_type=zipfile.ZIP_STORED)
+                else:
+                    zf.write(full_path, arcname, compress_type=zipfile.ZIP_DEFLATED, compresslevel=1)
+
+
+def write_tar_zst(src_dir: Path, out_path: Path, level: int = 3) -> None:
+    """
+    Archive the contents of src_dir into a zstd-compressed tarball, compressing on all cores.
+    Requires the optional 'zstandard' package.
+    """
+    if zstandard is None:
+        raise RuntimeError("zstandard is not installed (pip install zstandard)")
+    cctx = zstandard.ZstdCompressor(level=level, threads=-1)
+    with open(out_path, "wb") as fp, cctx.stream_writer(fp) as writer:
+        with tarfile.open(mode="w|", fileobj=writer) as tar:
+            for name in sorted(os.listdir(src_dir)):
+                tar.add(os.path.join(src_dir, name), arcname=name)
 
 
 def load_pack_info(path: Path) -> PackInfo:
     meta_path = path / "pack.mcmeta"
-    meta = read_json(meta_path)
+    try:
+        meta = _read_json_cached(str(meta_path), meta_path.stat().st_mtime_ns)
+    except OSError:
+        meta = None
     pack_format = None
     description = None
     if isinstance(meta, dict):
@@ -165,29 +330,34 @@ def load_pack_info(path: Path) -> PackInfo:
     )
 
 
-def is_lang_file(rel: Path) -> bool:
-    parts = rel.parts
-    return len(parts) >= 4 and parts[0] == "assets" and parts[2] == "lang" and rel.suffix == ".json"
-
-
-def is_sounds_json(rel: Path) -> bool:
-    parts = rel.parts
-    return len(parts) >= 3 and parts[0] == "assets" and parts[2] == "sounds.json"
-
-
-def is_font_json(rel: Path) -> bool:
-    parts = rel.parts
-    return len(parts) >= 4 and parts[0] == "assets" and parts[2] == "font" and rel.suffix == ".json"
-
-
-def is_atlases_json(rel: Path) -> bool:
-    parts = rel.parts
-    return len(parts) >= 4 and parts[0] == "assets" and parts[2] == "atlases" and rel.suffix == ".json"
-
-
-def is_tag_file(rel: Path) -> bool:
-    parts = rel.parts
-    return len(parts) >= 4 and parts[0] == "data" and parts[2] == "tags" and rel.suffix == ".json"
+# Merge strategy for a payload file, see classify()
+KIND_COPY = 0
+KIND_LANG = 1
+KIND_SOUNDS = 2
+KIND_FONT = 3
+KIND_ATLASES = 4
+KIND_TAG = 5
+
+
+def classify(parts: List[str], suffix: str) -> int:
+    """Return the KIND_* constant for a payload file, given its relative path parts and suffix."""
+    if len(parts) < 3:
+        return KIND_COPY
+    root, category = parts[0], parts[2]
+    if root == "assets":
+        if category == "sounds.json":
+            return KIND_SOUNDS
+        if len(parts) >= 4 and suffix == ".json":
+            if category == "lang":
+                return KIND_LANG
+            if category == "font":
+                return KIND_FONT
+            if category == "atlases":
+                return KIND_ATLASES
+    elif root == "data":
+        if category == "tags" and len(parts) >= 4 and suffix == ".json":
+            return KIND_TAG
+    return KIND_COPY
 
 
 @dataclass
@@ -200,6 +370,10 @@ class MergeStats:
 
 
 class Merger:
+    # Last-wins copies are submitted to the pool in batches of at most this size, so a pack
+    # with tens of thousands of small files doesn't pay for one future per file
+    COPY_BATCH_SIZE = 64
+
     def __init__(self, packs: List[PackInfo], out_dir: Path, dry_run: bool = False, clean: bool = False,
                  exclude_patterns: Optional[List[str]] = None,
                  pack_format_override: Optional[int] = None,
@@ -212,8 +386,13 @@ class Merger:
         self.exclude_patterns = exclude_patterns or []
         self.pack_format_override = pack_format_override
         self.description_override = description_override
+        self._stats_lock = threading.Lock()
+        # The hot loop builds output paths by string concatenation rather than Path objects
+        self.out_dir_str = str(out_dir)
 
     def run(self) -> None:
+        if self.clean:
+            _read_json_cached.cache_clear()
         if self.clean and self.out_dir.exists():
             if self.dry_run:
                 print(f"[dry-run] Would remove output directory: {self.out_dir}")
@@ -224,48 +403,134 @@ class Merger:
         self._write_pack_png()
         self._write_pack_mcmeta()
 
-        # Merge assets and data
-        handled_rel_paths: set[Path] = set()
+        # Collect payload files per rel_path first (pack priority order is kept within
+        # each group), so independent paths can be processed concurrently.
+        groups: dict[str, List[str]] = {}
         for pack in self.packs:
-            for rel_path in self._iter_payload_files(pack.path):
-                if self._is_excluded(rel_path):
+            for rel, src in self._iter_payload_files(pack.path):
+                if self._is_excluded(rel):
                     self.stats.skipped += 1
                     continue
-                out_path = self.out_dir / rel_path
-                if is_lang_file(rel_path):
-                    self._merge_lang_file(pack.path / rel_path, out_path)
-                elif is_sounds_json(rel_path):
-                    self._merge_sounds_json(pack.path / rel_path, out_path)
-                elif is_font_json(rel_path):
-                    self._merge_font_json(pack.path / rel_path, out_path)
-                elif is_atlases_json(rel_path):
-                    self._merge_atlases_json(pack.path / rel_path, out_path)
-                elif is_tag_file(rel_path):
-                    self._merge_tag_json(pack.path / rel_path, out_path)
+                groups.setdefault(rel, []).append(src)
+
+        # Split into JSON merges (folded in memory, written once) and plain last-wins
+        # copies. Only the highest priority pack's file matters for a copy.
+        merge_fns = (None, self._merge_lang, self._merge_sounds, self._merge_font,
+                     self._merge_atlases, self._merge_tags)  # indexed by KIND_*
+        merge_groups: List[tuple] = []
+        winners: dict[str, str] = {}
+        for rel, sources in groups.items():
+            parts = rel.split("/")
+            merge_fn = merge_fns[classify(parts, os.path.splitext(parts[-1])[1])]
+            if merge_fn is not None:
+                merge_groups.append((rel, sources, merge_fn))
+            else:
+                winners[rel] = sources[-1]
+                self.stats.overwritten += len(sources) - 1
+
+        if self.dry_run:
+            # Keep dry-run output deterministic
+            for rel, sources, merge_fn in merge_groups:
+                self._merge_group(rel, sources, merge_fn)
+            for rel, src in winners.items():
+                self._copy_last_wins(src, f"{self.out_dir_str}/{rel}")
+            return
+
+        # Create each output directory once, parents first, instead of a mkdir per written file
+        out_dirs = {rel.rpartition("/")[0] for rel in groups}
+        for rel_dir in sorted(out_dirs, key=lambda d: d.count("/")):
+            (self.out_dir / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        workers = self._max_workers()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._merge_group, rel, sources, merge_fn)
+                       for rel, sources, merge_fn in merge_groups]
+            copies = [(src, f"{self.out_dir_str}/{rel}") for rel, src in winners.items()]
+            # Spread the copies over every worker; batching only kicks in once there are
+            # more files than workers
+            batch = max(1, min(self.COPY_BATCH_SIZE, -(-len(copies) // workers)))
+            futures += [executor.submit(self._copy_batch, copies[i:i + batch])
+                        for i in range(0, len(copies), batch)]
+            for future in futures:
+                future.result()
+
+    @staticmethod
+    def _max_workers() -> int:
+        # Work is dominated by small-file I/O, so oversubscribe the CPUs
+        return min(32, (os.cpu_count() or 1) * 4)
+
+    def _merge_group(self, rel: str, sources: List[str], merge_fn) -> None:
+        # Fold every pack's copy of rel in priority order (lowest -> highest) in memory,
+        # then write the result once
+        dst = f"{self.out_dir_str}/{rel}"
+        if len(sources) == 1 and not self.dry_run:
+            # Nothing to merge with: copy the bytes instead of parsing and re-serializing
+            _fast_copy(sources[0], dst)
+            self._count("copied")
+            return
+        acc = None
+        for src in sources:
+            src_data = read_json(src)
+            if src_data is None:
+                self._count("skipped")
+                continue
+            try:
+                if acc is None:
+                    acc = src_data
+                    if self.dry_run:
+                        print(f"[dry-run] Would create {dst} (from {src})")
+                    self._count("copied")
                 else:
-                    self._copy_last_wins(pack.path / rel_path, out_path)
-                handled_rel_paths.add(rel_path)
+                    acc = merge_fn(acc, src_data)
+                    if self.dry_run:
+                        print(f"[dry-run] Would merge JSON into {dst} (from {src})")
+                    self._count("merged_json")
+            except Exception as e:
+                self._count("errors")
+                sys.stderr.write(f"ERROR: Failed to merge {src} -> {dst}: {e}\n")
+        if acc is None or self.dry_run:
+            return
+        try:
+            write_json(dst, acc)
+        except Exception as e:
+            self._count("errors")
+            sys.stderr.write(f"ERROR: Failed to write {dst}: {e}\n")
 
-    def _is_excluded(self, rel: Path) -> bool:
-        name = rel.name
+    def _count(self, field: str, n: int = 1) -> None:
+        # Handlers run on worker threads; serialize stats updates
+        with self._stats_lock:
+            setattr(self.stats, field, getattr(self.stats, field) + n)
+
+    def _is_excluded(self, rel: str) -> bool:
+        name = rel.rpartition("/")[2]
         if name in DEFAULT_EXCLUDES:
             return True
-        rel_str = str(rel)
         for pat in self.exclude_patterns:
-            if fnmatch(rel_str, pat):
+            if fnmatch(rel, pat):
                 return True
         return False
 
     def _iter_payload_files(self, base: Path):
-        # Yield all files under 'assets' and 'data' only
+        # Yield (rel, abs) string pairs for all files under 'assets' and 'data' only.
+        # rel always uses '/' separators. os.scandir reports the entry type from the
+        # directory listing itself, so no per-file stat or Path objects are needed.
+        base_str = str(base)
         for root_name in ("assets", "data"):
-            root = base / root_name
-            if not root.exists():
-                continue
-            for p in root.rglob('*'):
-                if p.is_file():
-                    rel = p.relative_to(base)
-                    yield rel
+            stack = [(os.path.join(base_str, root_name), root_name)]
+            while stack:
+                dir_path, dir_rel = stack.pop()
+                try:
+                    entries = os.scandir(dir_path)
+                except (FileNotFoundError, NotADirectoryError, PermissionError):
+                    # Skip unreadable directories like Path.rglob does, rather than abort the merge
+                    continue
+                with entries:
+                    for entry in entries:
+                        rel = f"{dir_rel}/{entry.name}"
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, rel))
+                        elif entry.is_file():
+                            yield rel, entry.path
 
     def _write_pack_png(self):
         # Use pack.png from highest priority pack that has one
@@ -307,129 +572,102 @@ class Merger:
         else:
             write_json(dst, meta)
 
-    def _merge_json_base(self, src: Path, dst: Path, merge_fn):
-        src_data = read_json(src)
-        if src_data is None:
-            self.stats.skipped += 1
-            return
-        if dst.exists():
-            dst_data = read_json(dst)
-        else:
-            dst_data = None
-        try:
-            if dst_data is None:
-                if self.dry_run:
-                    print(f"[dry-run] Would create {dst} (from {src})")
-                else:
-                    dst.parent.mkdir(parents=True, exist_ok=True)
-                    write_json(dst, src_data)
-                self.stats.copied += 1
-            else:
-                merged = merge_fn(dst_data, src_data)
-                if self.dry_run:
-                    print(f"[dry-run] Would merge JSON into {dst} (from {src})")
-                else:
-                    dst.parent.mkdir(parents=True, exist_ok=True)
-                    write_json(dst, merged)
-                self.stats.merged_json += 1
-        except Exception as e:
-            self.stats.errors += 1
-            sys.stderr.write(f"ERROR: Failed to merge {src} -> {dst}: {e}\n")
-
-    def _merge_lang_file(self, src: Path, dst: Path):
-        def merge(dst_data, src_data):
-            if not isinstance(dst_data, dict):
-                dst_data = {}
-            if not isinstance(src_data, dict):
-                return dst_data
-            out = dict(dst_data)
-            out.update(src_data)  # later packs override
-            return out
-        self._merge_json_base(src, dst, merge)
-
-    def _merge_sounds_json(self, src: Path, dst: Path):
-        def merge(dst_data, src_data):
-            if not isinstance(dst_data, dict):
-                dst_data = {}
-            if not isinstance(src_data, dict):
-                return dst_data
-            out = dict(dst_data)
-            out.update(src_data)
-            return out
-        self._merge_json_base(src, dst, merge)
-
-    def _merge_font_json(self, src: Path, dst: Path):
-        def merge(dst_data, src_data):
-            # Merge providers arrays
-            def providers(data):
-                if isinstance(data, dict):
-                    prov = data.get("providers")
-                    return prov if isinstance(prov, list) else []
-                return []
-            existing = providers(dst_data)
-            incoming = providers(src_data)
-            merged_list = _dedupe_json_array(existing + incoming)
-            base = dst_data if isinstance(dst_data, dict) else {}
-            base = dict(base)
-            base["providers"] = merged_list
-            return base
-        self._merge_json_base(src, dst, merge)
-
-    def _merge_atlases_json(self, src: Path, dst: Path):
-        def merge(dst_data, src_data):
-            def sources(data):
-                if isinstance(data, dict):
-                    arr = data.get("sources")
-                    return arr if isinstance(arr, list) else []
-                return []
-            existing = sources(dst_data)
-            incoming = sources(src_data)
-            merged_list = _dedupe_json_array(existing + incoming)
-            base = dst_data if isinstance(dst_data, dict) else {}
-            base = dict(base)
-            base["sources"] = merged_list
-            return base
-        self._merge_json_base(src, dst, merge)
-
-    def _merge_tag_json(self, src: Path, dst: Path):
-        def merge(dst_data, src_data):
-            # Union of values arrays; preserve replace flag if present in incoming
-            def arr(data):
-                if isinstance(data, dict):
-                    a = data.get("values")
-                    return a if isinstance(a, list) else []
-                return []
-            existing = arr(dst_data)
-            incoming = arr(src_data)
-            merged_values = _dedupe_json_array(existing + incoming)
-            replace_flag = None
-            if isinstance(src_data, dict) and isinstance(src_data.get("replace"), bool):
-                replace_flag = src_data["replace"]
-            base = dst_data if isinstance(dst_data, dict) else {}
-            base = dict(base)
-            base["values"] = merged_values
-            if replace_flag is not None:
-                base["replace"] = replace_flag
-            return base
-        self._merge_json_base(src, dst, merge)
-
-    def _copy_last_wins(self, src: Path, dst: Path):
-        if not src.exists():
-            self.stats.skipped += 1
-            return
-        if dst.exists():
-            action = "overwrite"
-        else:
-            action = "copy"
+    @staticmethod
+    def _merge_lang(dst_data, src_data):
+        if not isinstance(dst_data, dict):
+            dst_data = {}
+        if not isinstance(src_data, dict):
+            return dst_data
+        out = dict(dst_data)
+        out.update(src_data)  # later packs override
+        return out
+
+    @staticmethod
+    def _merge_sounds(dst_data, src_data):
+        if not isinstance(dst_data, dict):
+            dst_data = {}
+        if not isinstance(src_data, dict):
+            return dst_data
+        out = dict(dst_data)
+        out.update(src_data)
+        return out
+
+    @staticmethod
+    def _merge_font(dst_data, src_data):
+        # Merge providers arrays
+        def providers(data):
+            if isinstance(data, dict):
+                prov = data.get("providers")
+                return prov if isinstance(prov, list) else []
+            return []
+        existing = providers(dst_data)
+        incoming = providers(src_data)
+        merged_list = _dedupe_json_array(existing + incoming)
+        base = dst_data if isinstance(dst_data, dict) else {}
+        base = dict(base)
+        base["providers"] = merged_list
+        return base
+
+    @staticmethod
+    def _merge_atlases(dst_data, src_data):
+        def sources(data):
+            if isinstance(data, dict):
+                arr = data.get("sources")
+                return arr if isinstance(arr, list) else []
+            return []
+        existing = sources(dst_data)
+        incoming = sources(src_data)
+        merged_list = _dedupe_json_array(existing + incoming)
+        base = dst_data if isinstance(dst_data, dict) else {}
+        base = dict(base)
+        base["sources"] = merged_list
+        return base
+
+    @staticmethod
+    def _merge_tags(dst_data, src_data):
+        # Union of values arrays; preserve replace flag if present in incoming
+        def arr(data):
+            if isinstance(data, dict):
+                a = data.get("values")
+                return a if isinstance(a, list) else []
+            return []
+        existing = arr(dst_data)
+        incoming = arr(src_data)
+        merged_values = _dedupe_json_array(existing + incoming)
+        replace_flag = None
+        if isinstance(src_data, dict) and isinstance(src_data.get("replace"), bool):
+            replace_flag = src_data["replace"]
+        base = dst_data if isinstance(dst_data, dict) else {}
+        base = dict(base)
+        base["values"] = merged_values
+        if replace_flag is not None:
+            base["replace"] = replace_flag
+        return base
+
+    def _copy_batch(self, pairs: List[tuple]) -> None:
+        for src, dst in pairs:
+            self._copy_last_wins(src, dst)
+
+    def _copy_last_wins(self, src: str, dst: str):
+        # src is the already-resolved winner for this path
         if self.dry_run:
-            print(f"[dry-run] Would {action} {dst} (from {src})")
-        else:
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-        if action == "overwrite":
-            self.stats.overwritten += 1
+            print(f"[dry-run] Would copy {dst} (from {src})")
         else:
-            self.stats.copied += 1
+            _fast_copy(src, dst)
+        self._count("copied")
+
+
+def _json_dedupe_key(it: Any) -> Any:
+    # Plain strings (the bulk of tag values) are their own key; other scalars are
+    # tagged with their type so 1, 1.0 and True stay distinct.
+    if isinstance(it, str):
+        return it
+    if it is None or isinstance(it, (bool, int, float)):
+        return (type(it).__name__, it)
+    if orjson is not None:
+        # The canonical bytes themselves are the key: hashable, and unlike a digest lossless
+        return orjson.dumps(it, option=orjson.OPT_SORT_KEYS)
+    return ("json", json.dumps(it, sort_keys=True))
 
 
 def _dedupe_json_array(items: List[Any]) -> List[Any]:
@@ -437,7 +675,7 @@ def _dedupe_json_array(items: List[Any]) -> List[Any]:
     out = []
     for it in items:
         try:
-            key = json.dumps(it, sort_keys=True)
+            key = _json_dedupe_key(it)
         except TypeError:
             # Unserializable -> fallback to str
             key = str(it)
@@ -459,6 +697,7 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     p.add_argument("--pack-format", type=int, dest="pack_format", help="Override pack_format for generated pack.mcmeta.")
     p.add_argument("--description", type=str, dest="description", help="Override description for generated pack.mcmeta.")
     p.add_argument("--zip", dest="zip_output", action="store_true", help="Create a .zip of the merged pack in addition to the folder.")
+    p.add_argument("--tar-zst", dest="tar_zst_output", action="store_true", help="Create a .tar.zst of the merged pack (requires zstandard).")
     return p.parse_args(argv)
 
 
@@ -466,6 +705,10 @@ def main(argv: List[str]) -> int:
     args = parse_args(argv)
     cwd = Path.cwd()
 
+    if args.tar_zst_output and zstandard is None:
+        print("ERROR: --tar-zst requires the zstandard package (pip install zstandard).")
+        return 2
+
     if args.packs:
         pack_paths = [Path(p) if Path(p).is_absolute() else cwd / p for p in args.packs]
     else:
@@ -513,12 +756,16 @@ def main(argv: List[str]) -> int:
 
     # Optionally pack to zip
     if args.zip_output and not args.dry_run:
-        base_name = out_dir.with_suffix("")  # ensure no .zip duplicate suffix
         zip_path = out_dir.parent / f"{out_dir.name}.zip"
         if zip_path.exists():
             zip_path.unlink()
         print(f"Creating zip: {zip_path}")
-        shutil.make_archive(str(zip_path.with_suffix("")), 'zip', root_dir=out_dir)
+        write_zip(out_dir, zip_path)
+
+    if args.tar_zst_output and not args.dry_run:
+        tar_path = out_dir.parent / f"{out_dir.name}.tar.zst"
+        print(f"Creating tar.zst: {tar_path}")
+        write_tar_zst(out_dir, tar_path)
 
     return 0
 
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the web app: scratch folder safety, scratch space accounting and the upload/merge flow
+"""
+import io
+import json
+import os
+import shutil
+import zipfile
+from collections import namedtuple
+
+import pytest
+
+import app as app_module
+
+MB = 1024 * 1024
+MCMETA = json.dumps({"pack": {"pack_format": 15, "description": "test"}})
+DiskUsage = namedtuple('DiskUsage', 'total used free')
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    config = app_module.app.config
+    monkeypatch.setitem(config, 'UPLOAD_FOLDER', tmp_path / 'uploads')
+    monkeypatch.setitem(config, 'OUTPUT_FOLDER', tmp_path / 'outputs')
+    monkeypatch.setitem(config, 'SCRATCH_FOLDER', tmp_path / 'scratch')
+    for key in ('UPLOAD_FOLDER', 'OUTPUT_FOLDER', 'SCRATCH_FOLDER'):
+        config[key].mkdir()
+    return app_module.app.test_client()
+
+
+def _fake_disk_usage(monkeypatch, free, total=1000 * MB):
+    monkeypatch.setattr(shutil, 'disk_usage', lambda path: DiskUsage(total, total - free, free))
+
+
+def _pack_zip(lang):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr('pack.mcmeta', MCMETA)
+        zf.writestr('assets/mc/lang/en_us.json', json.dumps(lang))
+    buf.seek(0)
+    return buf
+
+
+def _upload(client, *packs):
+    data = {'packs': [(_pack_zip(lang), f'{name}.zip') for name, lang in packs]}
+    return client.post('/upload', data=data, content_type='multipart/form-data')
+
+
+def test_private_scratch_dir(tmp_path):
+    path = tmp_path / 'scratch'
+    assert app_module.private_scratch_dir(path) == path
+    assert os.lstat(path).st_mode & 0o777 == 0o700
+    # An existing private directory is reused
+    assert app_module.private_scratch_dir(path) == path
+
+    link = tmp_path / 'link'
+    link.symlink_to(path)
+    with pytest.raises(OSError):
+        app_module.private_scratch_dir(link)
+
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(OSError):
+        app_module.private_scratch_dir(shared)
+
+
+def test_reserve_scratch_accounting(client, monkeypatch):
+    # 100 MB headroom (10% of 1000 MB) of 500 MB free leaves 400 MB to hand out
+    _fake_disk_usage(monkeypatch, free=500 * MB)
+    assert app_module.reserve_scratch(300 * MB)
+    assert not app_module.reserve_scratch(150 * MB)
+    assert app_module.reserve_scratch(100 * MB)
+    assert app_module._scratch_reserved == 400 * MB
+    app_module.release_scratch(300 * MB)
+    app_module.release_scratch(100 * MB)
+    assert app_module._scratch_reserved == 0
+    assert app_module.reserve_scratch(400 * MB)
+    app_module.release_scratch(400 * MB)
+
+
+def test_upload_falls_back_without_scratch_space(client, monkeypatch):
+    _fake_disk_usage(monkeypatch, free=10 * MB)
+    response = _upload(client, ('a', {'k': 'a'}))
+    assert response.status_code == 200
+    session_id = response.get_json()['session_id']
+    config = app_module.app.config
+    assert (config['UPLOAD_FOLDER'] / session_id / 'temp' / 'a' / 'pack.mcmeta').is_file()
+    assert not (config['SCRATCH_FOLDER'] / session_id).exists()
+    assert app_module._scratch_reserved == 0
+
+
+def test_merge_reextracts_after_scratch_cleanup(client):
+    response = _upload(client, ('a', {'k1': 'a', 'k2': 'a'}), ('b', {'k2': 'b'}))
+    assert response.status_code == 200
+    session_id = response.get_json()['session_id']
+    scratch_session = app_module.app.config['SCRATCH_FOLDER'] / session_id
+    assert scratch_session.is_dir()
+
+    for _ in range(2):
+        response = client.post('/merge', json={
+            'session_id': session_id, 'pack_order': ['a', 'b'], 'output_name': 'm',
+        })
+        assert response.status_code == 200
+        assert response.get_json()['stats']['merged_json'] == 1
+        # The extracted packs are dropped from scratch once the merge is done
+        assert not scratch_session.exists()
+
+    merged = app_module.app.config['OUTPUT_FOLDER'] / f'{session_id}_m' / 'assets/mc/lang/en_us.json'
+    assert json.loads(merged.read_text()) == {'k1': 'a', 'k2': 'b'}
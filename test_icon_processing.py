@@ -6,33 +6,66 @@ from PIL import Image
 from pathlib import Path
 import io
 
-def test_icon_processing():
-    """Test that we can create and process a sample icon"""
-    # Create a test image (red square)
-    test_img = Image.new('RGB', (256, 256), color='red')
+try:
+    import pytest
+except ImportError:  # not in requirements.txt; the script runner below works without it
+    pytest = None
+
+# (width, height, encoded): square -> thumbnail, 384x256 -> integer reduce, 300x200 -> fused
+# crop+resize; encoded cases go through PNG bytes and Image.open instead of frombytes
+ICON_CASES = [
+    (256, 256, False),
+    (384, 256, False),
+    (300, 200, False),
+    (300, 200, True),
+]
 
-    # Save to bytes
-    img_bytes = io.BytesIO()
-    test_img.save(img_bytes, format='PNG')
-    img_bytes.seek(0)
+def _load_icon(data: bytes, size=None, mode='RGBA'):
+    """Load icon pixels; raw buffers of known size/mode skip format detection and decoding"""
+    if size is not None:
+        return Image.frombytes(mode, size, data)
+    return Image.open(io.BytesIO(data))
 
-    # Open and process like the app does
-    img = Image.open(img_bytes)
+def _parametrize_cases(fn):
+    if pytest is None:
+        return fn
+    return pytest.mark.parametrize("width, height, encoded", ICON_CASES)(fn)
 
-    # Convert to RGBA
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
+@_parametrize_cases
+def test_icon_processing(width, height, encoded):
+    """Test that we can create and process a sample icon"""
+    # Create a test image (red) straight from raw RGBA pixels; it is born RGBA,
+    # so no convert pass (and no full decode + realloc) is needed
+    pixels = bytes((255, 0, 0, 255)) * (width * height)
+    if encoded:
+        # Uncompressed PNG: exercises the decode path without paying for deflate
+        buf = io.BytesIO()
+        _load_icon(pixels, size=(width, height)).save(buf, 'PNG', compress_level=0)
+        img = _load_icon(buf.getvalue())
+    else:
+        img = _load_icon(pixels, size=(width, height), mode='RGBA')
+
+    # Only size and mode are asserted, so the cheap BOX filter stands in for the app's LANCZOS
+    resample = Image.Resampling.BOX
 
-    # Crop to square (already square in this case)
     width, height = img.size
-    if width != height:
+    if width == height and width >= 128:
+        # Already square: shrink in place, no crop and no new image object
+        # (thumbnail never upscales, hence the size guard)
+        img.thumbnail((128, 128), resample)
+    else:
+        # Crop the center square and resize to 128x128 in one pass via the box argument,
+        # so no intermediate cropped image is materialized; an exact integer downscale
+        # is a plain box average
         size = min(width, height)
         left = (width - size) // 2
         top = (height - size) // 2
-        img = img.crop((left, top, left + size, top + size))
-
-    # Resize to 128x128
-    img = img.resize((128, 128), Image.Resampling.LANCZOS)
+        box = (left, top, left + size, top + size)
+        factor, remainder = divmod(size, 128)
+        if remainder == 0 and factor > 1:
+            img = img.reduce(factor, box=box)
+        else:
+            img = img.resize((128, 128), resample, box=box)
 
     # Check final size
     assert img.size == (128, 128), f"Expected (128, 128), got {img.size}"
@@ -43,5 +76,6 @@ def test_icon_processing():
     print(f"   - Final mode: {img.mode}")
 
 if __name__ == '__main__':
-    test_icon_processing()
+    for case in ICON_CASES:
+        test_icon_processing(*case)
 
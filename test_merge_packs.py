@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Tests for merge_packs: zip pack extraction, path classification and merging
+"""
+import itertools
+import json
+import os
+import zipfile
+from pathlib import PurePosixPath
+
+import pytest
+
+from merge_packs import (
+    KIND_ATLASES, KIND_COPY, KIND_FONT, KIND_LANG, KIND_SOUNDS, KIND_TAG,
+    Merger, _dedupe_json_array, classify, extract_zip_pack, load_pack_info, read_json,
+)
+
+MCMETA = json.dumps({"pack": {"pack_format": 15, "description": "test"}})
+
+
+def _make_zip(path, members):
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def test_extract_zip_root_pack(tmp_path):
+    zip_path = _make_zip(tmp_path / "root.zip", {
+        "pack.mcmeta": MCMETA,
+        "assets/minecraft/lang/en_us.json": "{}",
+    })
+    root = extract_zip_pack(zip_path, tmp_path / "temp")
+    assert root == tmp_path / "temp" / "root"
+    assert (root / "pack.mcmeta").is_file()
+    assert (root / "assets/minecraft/lang/en_us.json").is_file()
+
+
+def test_extract_zip_nested_pack(tmp_path):
+    zip_path = _make_zip(tmp_path / "nested.zip", {
+        "outer/inner/pack.mcmeta": MCMETA,
+        "outer/inner/assets/minecraft/textures/a.png": b"png",
+        "outer/readme.txt": "not part of the pack",
+    })
+    root = extract_zip_pack(zip_path, tmp_path / "temp")
+    assert root == tmp_path / "temp" / "nested" / "outer" / "inner"
+    assert (root / "assets/minecraft/textures/a.png").read_bytes() == b"png"
+    # Only the pack subtree is extracted
+    assert not (tmp_path / "temp" / "nested" / "outer" / "readme.txt").exists()
+
+
+def test_extract_zip_too_deep(tmp_path):
+    zip_path = _make_zip(tmp_path / "deep.zip", {"a/b/c/d/pack.mcmeta": MCMETA})
+    assert extract_zip_pack(zip_path, tmp_path / "temp") is None
+    assert not (tmp_path / "temp").exists()
+
+
+def test_extract_zip_bad_mcmeta(tmp_path):
+    zip_path = _make_zip(tmp_path / "bad.zip", {
+        "pack.mcmeta": "{not json",
+        "other/pack.mcmeta": json.dumps({"no_pack_key": 1}),
+    })
+    assert extract_zip_pack(zip_path, tmp_path / "temp") is None
+
+
+def test_extract_zip_skips_cruft(tmp_path):
+    zip_path = _make_zip(tmp_path / "cruft.zip", {
+        "pack.mcmeta": MCMETA,
+        "__MACOSX/._pack.mcmeta": "",
+        ".git/config": "",
+        "assets/.DS_Store": "",
+        "assets/minecraft/sounds.json": "{}",
+    })
+    root = extract_zip_pack(zip_path, tmp_path / "temp")
+    assert not (root / "__MACOSX").exists()
+    assert not (root / ".git").exists()
+    assert not (root / "assets/.DS_Store").exists()
+    assert (root / "assets/minecraft/sounds.json").is_file()
+
+
+def test_extract_zip_absolute_member(tmp_path):
+    zip_path = _make_zip(tmp_path / "abs.zip", {
+        "/pack.mcmeta": MCMETA,
+        "/assets/minecraft/lang/en_us.json": "{}",
+        "assets/minecraft/sounds.json": "{}",
+    })
+    root = extract_zip_pack(zip_path, tmp_path / "temp")
+    assert root == tmp_path / "temp" / "abs"
+    assert (root / "pack.mcmeta").is_file()
+    assert (root / "assets/minecraft/lang/en_us.json").is_file()
+    assert (root / "assets/minecraft/sounds.json").is_file()
+
+
+def test_extract_zip_parent_member_stays_inside(tmp_path):
+    zip_path = _make_zip(tmp_path / "evil.zip", {"../evil/pack.mcmeta": MCMETA})
+    temp_dir = tmp_path / "temp"
+    root = extract_zip_pack(zip_path, temp_dir)
+    assert root == temp_dir / "evil" / "evil"
+    assert (root / "pack.mcmeta").is_file()
+    assert not (tmp_path / "evil").exists()
+
+
+@pytest.mark.parametrize("rel, kind", [
+    ("assets/mc/lang/en_us.json", KIND_LANG),
+    ("assets/mc/lang/sub/en_us.json", KIND_LANG),
+    ("assets/mc/lang/en_us.lang", KIND_COPY),
+    ("assets/mc/lang", KIND_COPY),
+    ("assets/mc/sounds.json", KIND_SOUNDS),
+    ("assets/mc/sounds.json/x.png", KIND_SOUNDS),
+    ("assets/sounds.json", KIND_COPY),
+    ("assets/mc/font/default.json", KIND_FONT),
+    ("assets/mc/atlases/blocks.json", KIND_ATLASES),
+    ("assets/mc/textures/a.png", KIND_COPY),
+    ("assets/mc/models/a.json", KIND_COPY),
+    ("data/mc/tags/items/t.json", KIND_TAG),
+    ("data/mc/tags/t.json", KIND_TAG),
+    ("data/mc/tags/t.txt", KIND_COPY),
+    ("data/mc/lang/en_us.json", KIND_COPY),
+    ("assets/mc/tags/t.json", KIND_COPY),
+    ("other/mc/lang/en_us.json", KIND_COPY),
+])
+def test_classify_table(rel, kind):
+    parts = rel.split("/")
+    assert classify(parts, PurePosixPath(rel).suffix) == kind
+
+
+def _classify_reference(rel: PurePosixPath) -> int:
+    # The per-kind predicates classify() replaced, checked in the same order
+    parts, suffix = rel.parts, rel.suffix
+    if len(parts) >= 4 and parts[0] == "assets" and parts[2] == "lang" and suffix == ".json":
+        return KIND_LANG
+    if len(parts) >= 3 and parts[0] == "assets" and parts[2] == "sounds.json":
+        return KIND_SOUNDS
+    if len(parts) >= 4 and parts[0] == "assets" and parts[2] == "font" and suffix == ".json":
+        return KIND_FONT
+    if len(parts) >= 4 and parts[0] == "assets" and parts[2] == "atlases" and suffix == ".json":
+        return KIND_ATLASES
+    if len(parts) >= 4 and parts[0] == "data" and parts[2] == "tags" and suffix == ".json":
+        return KIND_TAG
+    return KIND_COPY
+
+
+def test_classify_matches_reference():
+    names = ["assets", "data", "lang", "font", "atlases", "tags", "sounds.json", "a.json", "a.png"]
+    for n in range(1, 6):
+        for parts in itertools.product(names, repeat=n):
+            rel = PurePosixPath(*parts)
+            assert classify(list(parts), rel.suffix) == _classify_reference(rel), rel
+
+
+def test_dedupe_json_array():
+    items = [
+        "mc:a", {"id": "mc:b", "required": False}, "mc:a",
+        {"required": False, "id": "mc:b"},  # same object, different key order
+        {"id": "mc:b", "required": True},
+        1, 1.0, True, None, None,
+    ]
+    assert _dedupe_json_array(items) == [
+        "mc:a", {"id": "mc:b", "required": False}, {"id": "mc:b", "required": True},
+        1, 1.0, True, None,
+    ]
+
+
+def test_read_json_keeps_wide_integers(tmp_path):
+    path = tmp_path / "wide.json"
+    path.write_text('{"big": 123456789012345678901234567890, "u64": 18446744073709551615, "f": 0.5}')
+    assert read_json(path) == {"big": 123456789012345678901234567890, "u64": 18446744073709551615, "f": 0.5}
+
+
+def test_merger_keeps_wide_integers(tmp_path):
+    lang = "assets/mc/lang/en_us.json"
+    packs = [
+        _make_pack(tmp_path / "a", 15, {lang: '{"a": 123456789012345678901234567890}'}),
+        _make_pack(tmp_path / "b", 15, {lang: '{"b": 1}'}),
+    ]
+    Merger(packs, out_dir=tmp_path / "out").run()
+    assert json.loads((tmp_path / "out" / lang).read_text()) == {"a": 123456789012345678901234567890, "b": 1}
+
+
+def _make_pack(root, pack_format, files):
+    root.mkdir(parents=True)
+    meta = {"pack": {"description": root.name}}
+    if pack_format is not None:
+        meta["pack"]["pack_format"] = pack_format
+    (root / "pack.mcmeta").write_text(json.dumps(meta))
+    for rel, data in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(data, bytes):
+            path.write_bytes(data)
+        else:
+            path.write_text(data if isinstance(data, str) else json.dumps(data))
+    return load_pack_info(root)
+
+
+def test_merger_run(tmp_path):
+    lang = "assets/mc/lang/en_us.json"
+    tag = "data/mc/tags/items/t.json"
+    png = "assets/mc/textures/x.png"
+    packs = [  # lowest -> highest priority
+        _make_pack(tmp_path / "a", 15, {
+            lang: {"k1": "a", "k2": "a"},
+            tag: {"values": ["mc:a", "mc:b"]},
+            png: b"A",
+            "assets/mc/textures/only_a.png": b"only",
+            # Single-source JSON is copied byte for byte, malformed or not
+            "assets/mc/sounds.json": '{"s":{"sounds":["x"]}}',
+            "assets/mc/font/default.json": "{broken",
+            "assets/mc/.DS_Store": b"",
+        }),
+        _make_pack(tmp_path / "b", 18, {
+            lang: {"k2": "b", "k3": "b"},
+            tag: {"replace": True, "values": ["mc:b", "mc:c"]},
+            png: b"B",
+            "pack.png": b"icon-b",
+        }),
+        _make_pack(tmp_path / "c", None, {
+            lang: {"k3": "c"},
+            tag: {"values": ["mc:d"]},
+            png: b"C",
+        }),
+    ]
+    out = tmp_path / "out"
+    merger = Merger(packs, out_dir=out)
+    merger.run()
+
+    assert json.loads((out / lang).read_text()) == {"k1": "a", "k2": "b", "k3": "c"}
+    # Values are unioned in priority order; a later pack without "replace" keeps the flag
+    assert json.loads((out / tag).read_text()) == {
+        "values": ["mc:a", "mc:b", "mc:c", "mc:d"], "replace": True,
+    }
+    assert (out / png).read_bytes() == b"C"
+    assert (out / "assets/mc/textures/only_a.png").read_bytes() == b"only"
+    assert (out / "assets/mc/sounds.json").read_text() == '{"s":{"sounds":["x"]}}'
+    assert (out / "assets/mc/font/default.json").read_text() == "{broken"
+    assert not (out / "assets/mc/.DS_Store").exists()
+    assert (out / "pack.png").read_bytes() == b"icon-b"
+    meta = json.loads((out / "pack.mcmeta").read_text())
+    assert meta["pack"]["pack_format"] == 18
+
+    s = merger.stats
+    # lang + tag (first source each), x.png winner, only_a.png, sounds.json, font
+    assert s.copied == 6
+    assert s.overwritten == 2  # x.png from a and b
+    assert s.merged_json == 4  # lang and tag, two merges each
+    assert s.skipped == 1  # .DS_Store
+    assert s.errors == 0
+
+
+@pytest.mark.parametrize("files, workers, expected", [
+    (5, 8, [1] * 5),
+    (40, 8, [5] * 8),
+    (1000, 4, [64] * 15 + [40]),
+])
+def test_merger_copy_batches(tmp_path, monkeypatch, files, workers, expected):
+    pack = _make_pack(tmp_path / "a", 15, {f"assets/mc/textures/{i}.png": b"x" for i in range(files)})
+    batches = []
+    original = Merger._copy_batch
+
+    def record(self, pairs):
+        batches.append(len(pairs))
+        original(self, pairs)
+
+    monkeypatch.setattr(Merger, "_copy_batch", record)
+    monkeypatch.setattr(Merger, "_max_workers", staticmethod(lambda: workers))
+    merger = Merger([pack], out_dir=tmp_path / "out")
+    merger.run()
+    assert sorted(batches, reverse=True) == expected
+    assert merger.stats.copied == files
+
+
+def test_merger_skips_unreadable_directory(tmp_path, monkeypatch):
+    pack = _make_pack(tmp_path / "a", 15, {
+        "assets/mc/textures/ok.png": b"ok",
+        "assets/mc/locked/x.png": b"x",
+    })
+    locked = str(tmp_path / "a" / "assets/mc/locked")
+    scandir = os.scandir
+
+    def guarded_scandir(path):
+        # Simulates a directory without read permission (chmod doesn't stop root)
+        if path == locked:
+            raise PermissionError(13, "Permission denied", path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", guarded_scandir)
+    merger = Merger([pack], out_dir=tmp_path / "out")
+    merger.run()
+    assert (tmp_path / "out" / "assets/mc/textures/ok.png").read_bytes() == b"ok"
+    assert not (tmp_path / "out" / "assets/mc/locked").exists()
@@ -2,63 +2,99 @@
 """
 测试脚本 - 验证资源包合并功能
 """
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import functools
+import importlib.util
+import io
+import logging
+import os
+import stat
 import sys
+import threading
+
+log = logging.getLogger(__name__)
+
+# 手动检查已知的包
+KNOWN_PACKS: tuple[str, ...] = (
+    "guns++-5.8.4",
+    "Gamingbarn's Guns - Resources V1",
+    "Armor",
+    "NOTLIVES's SWAT Shield 1",
+)
+
+_BANNER = "=" * 60 + "\n"
+
+@functools.cache
+def _get_app():
+    """Import the Flask app once and share it between tests"""
+    from app import app
+    return app
 
 def test_imports():
     """测试所有必要的导入"""
-    print("🧪 测试导入...")
+    log.info("🧪 测试导入...")
     try:
-        import flask
-        print("  ✅ Flask")
-        import werkzeug
-        print("  ✅ Werkzeug")
-        from merge_packs import (
-            is_valid_resource_pack,
-            detect_packs,
-            load_pack_info,
-            Merger
-        )
-        print("  ✅ merge_packs 模块")
+        # Presence checks only: find_spec locates a module without executing it
+        for module, label in (("flask", "Flask"), ("werkzeug", "Werkzeug")):
+            if importlib.util.find_spec(module) is None:
+                raise ImportError(f"No module named '{module}'")
+            log.info("  ✅ %s", label)
+        import PIL
+        from PIL import features
+        log.info("  ✅ Pillow %s", PIL.__version__)
+        if not features.check_feature('libjpeg_turbo'):
+            log.warning("  ⚠️  Pillow 未使用 libjpeg-turbo 构建，JPEG 图标解码较慢")
+        # Import merge_packs for real: test_detect_packs may return before importing it,
+        # and a syntax error or a missing name must fail here
+        from merge_packs import Merger, load_pack_info, detect_packs, is_valid_resource_pack
+        log.info("  ✅ merge_packs 模块")
         return True
-    except ImportError as e:
-        print(f"  ❌ 导入失败: {e}")
+    except (ImportError, SyntaxError) as e:
+        log.error("  ❌ 导入失败: %s", e)
         return False
 
 def test_detect_packs():
     """测试资源包检测"""
-    print("\n🧪 测试资源包检测...")
-    from merge_packs import detect_packs, is_valid_resource_pack
-
+    log.info("\n🧪 测试资源包检测...")
     cwd = Path.cwd()
 
-    # 手动检查已知的包
-    known_packs = [
-        "guns++-5.8.4",
-        "Gamingbarn's Guns - Resources V1",
-        "Armor",
-        "NOTLIVES's SWAT Shield 1"
-    ]
+    # One directory read instead of a stat per known pack; keep only real directories
+    # that carry a known pack name
+    with os.scandir(cwd) as it:
+        present = {e.name: e for e in it
+                   if e.name in KNOWN_PACKS and e.is_dir(follow_symlinks=False)}
+
+    # Common dev case: nothing installed, so skip the import and the per-pack checks
+    if not present:
+        log.info("  ⚠️  未找到资源包（这是正常的，如果你还没上传包的话）")
+        return True
 
+    from merge_packs import detect_packs, is_valid_resource_pack
+
+    # Collect the report and write it in one go
+    lines = []
     found = []
-    for pack_name in known_packs:
-        pack_path = cwd / pack_name
-        if pack_path.exists() and is_valid_resource_pack(pack_path):
+    for pack_name in KNOWN_PACKS:
+        entry = present.get(pack_name)
+        if entry is None:
+            continue
+        if is_valid_resource_pack(Path(entry.path)):
             found.append(pack_name)
-            print(f"  ✅ 找到: {pack_name}")
+            lines.append(f"  ✅ 找到: {pack_name}")
         else:
-            print(f"  ℹ️  未找到: {pack_name}")
+            lines.append(f"  ℹ️  未找到: {pack_name}")
 
     if found:
-        print(f"\n  总计找到 {len(found)} 个有效资源包")
-        return True
+        lines.append(f"\n  总计找到 {len(found)} 个有效资源包")
     else:
-        print("\n  ⚠️  未找到资源包（这是正常的，如果你还没上传包的话）")
-        return True
+        lines.append("\n  ⚠️  未找到资源包（这是正常的，如果你还没上传包的话）")
+    log.info("\n".join(lines))
+    return True
 
 def test_file_structure():
     """测试文件结构"""
-    print("\n🧪 测试文件结构...")
+    log.info("\n🧪 测试文件结构...")
     required_files = [
         "merge_packs.py",
         "app.py",
@@ -68,83 +104,150 @@ def test_file_structure():
         "QUICKSTART.md"
     ]
 
+    # One directory listing per distinct parent instead of a stat per file;
+    # plain string splitting, no Path objects
+    split_paths = [os.path.split(file_path) for file_path in required_files]
+    by_parent = {}
+    for parent, _ in split_paths:
+        if parent in by_parent:
+            continue
+        try:
+            with os.scandir(parent or '.') as it:
+                by_parent[parent] = {e.name for e in it}
+        except FileNotFoundError:
+            by_parent[parent] = set()
+
+    lines = []
     all_exist = True
-    for file_path in required_files:
-        path = Path(file_path)
-        if path.exists():
-            print(f"  ✅ {file_path}")
+    for file_path, (parent, name) in zip(required_files, split_paths):
+        if name in by_parent[parent]:
+            lines.append(f"  ✅ {file_path}")
         else:
-            print(f"  ❌ {file_path} 不存在")
+            lines.append(f"  ❌ {file_path} 不存在")
             all_exist = False
 
+    log.info("\n".join(lines))
     return all_exist
 
 def test_directories():
     """测试必要的目录"""
-    print("\n🧪 测试目录结构...")
+    log.info("\n🧪 测试目录结构...")
     required_dirs = ["templates", "uploads", "outputs"]
 
-    all_exist = True
+    lines = []
     for dir_name in required_dirs:
         dir_path = Path(dir_name)
-        if dir_path.exists() and dir_path.is_dir():
-            print(f"  ✅ {dir_name}/")
+        # A single stat answers both "exists" and "is a directory"
+        try:
+            is_dir = stat.S_ISDIR(os.stat(dir_path).st_mode)
+        except FileNotFoundError:
+            is_dir = False
+        if is_dir:
+            lines.append(f"  ✅ {dir_name}/")
         else:
-            print(f"  ⚠️  {dir_name}/ 不存在，正在创建...")
+            lines.append(f"  ⚠️  {dir_name}/ 不存在，正在创建...")
             dir_path.mkdir(exist_ok=True)
-            print(f"  ✅ {dir_name}/ 已创建")
+            lines.append(f"  ✅ {dir_name}/ 已创建")
 
+    log.info("\n".join(lines))
     return True
 
 def test_flask_app():
     """测试Flask应用配置"""
-    print("\n🧪 测试Flask应用配置...")
+    log.info("\n🧪 测试Flask应用配置...")
     try:
-        from app import app
-        print(f"  ✅ Flask应用已加载")
-        print(f"  ✅ 上传文件夹: {app.config['UPLOAD_FOLDER']}")
-        print(f"  ✅ 输出文件夹: {app.config['OUTPUT_FOLDER']}")
-        print(f"  ✅ 最大上传大小: {app.config['MAX_CONTENT_LENGTH'] / (1024*1024):.0f}MB")
+        app = _get_app()
+        log.info("  ✅ Flask应用已加载")
+        log.info("  ✅ 上传文件夹: %s", app.config['UPLOAD_FOLDER'])
+        log.info("  ✅ 输出文件夹: %s", app.config['OUTPUT_FOLDER'])
+        log.info("  ✅ 最大上传大小: %.0fMB", app.config['MAX_CONTENT_LENGTH'] / (1024*1024))
         return True
     except Exception as e:
-        print(f"  ❌ Flask应用加载失败: {e}")
+        log.error("  ❌ Flask应用加载失败: %s", e)
         return False
 
-def main():
-    print("=" * 60)
-    print("Minecraft 资源包合并器 - 系统测试")
-    print("=" * 60)
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that sends a capturing thread's prints to its own buffer"""
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
 
-    results = []
+    def capture(self):
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
 
-    results.append(("导入测试", test_imports()))
-    results.append(("文件结构测试", test_file_structure()))
-    results.append(("目录结构测试", test_directories()))
-    results.append(("Flask应用测试", test_flask_app()))
-    results.append(("资源包检测测试", test_detect_packs()))
+    def release(self):
+        self._local.buffer = None
 
-    print("\n" + "=" * 60)
-    print("测试总结")
-    print("=" * 60)
+    def write(self, s):
+        buffer = getattr(self._local, 'buffer', None)
+        return (buffer if buffer is not None else self._stream).write(s)
 
-    all_passed = True
-    for name, result in results:
-        status = "✅ 通过" if result else "❌ 失败"
-        print(f"{status} - {name}")
-        if not result:
-            all_passed = False
+    def flush(self):
+        self._stream.flush()
 
-    print("=" * 60)
+def _run_captured(test):
+    """Run a test with its output buffered; returns (result, output)"""
+    buffer = sys.stdout.capture()
+    try:
+        return test(), buffer.getvalue()
+    finally:
+        sys.stdout.release()
+
+def main():
+    sys.stdout.write(_BANNER + "Minecraft 资源包合并器 - 系统测试\n" + _BANNER)
+
+    tests = [
+        ("导入测试", test_imports),
+        ("文件结构测试", test_file_structure),
+        ("目录结构测试", test_directories),
+        ("Flask应用测试", test_flask_app),
+        ("资源包检测测试", test_detect_packs),
+    ]
+
+    real_stdout = sys.stdout
+    sys.stdout = _ThreadOutput(real_stdout)
+    # Test chatter goes through logging (silence with TEST_LOGLEVEL=WARNING); the handler
+    # writes via the stdout proxy so each test's lines are still buffered per thread
+    logging.basicConfig(level=os.environ.get('TEST_LOGLEVEL', 'INFO'), format='%(message)s',
+                        stream=sys.stdout)
+    try:
+        # test_directories creates the folders the Flask app expects, so it runs first;
+        # the rest are independent and run concurrently
+        outcomes = {test_directories: _run_captured(test_directories)}
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {test: executor.submit(_run_captured, test)
+                       for _, test in tests if test is not test_directories}
+            outcomes.update({test: future.result() for test, future in futures.items()})
+    finally:
+        sys.stdout = real_stdout
+
+    # Replay each test's output in the original order
+    results = []
+    for name, test in tests:
+        result, output = outcomes[test]
+        sys.stdout.write(output)
+        results.append((name, result))
+
+    # Summary block assembled up front and written once
+    all_passed = all(result for _, result in results)
+    sys.stdout.write(
+        "\n" + _BANNER + "测试总结\n" + _BANNER
+        + "".join(f"{'✅ 通过' if result else '❌ 失败'} - {name}\n" for name, result in results)
+        + _BANNER
+    )
 
     if all_passed:
-        print("\n🎉 所有测试通过！系统已就绪。")
-        print("\n下一步:")
-        print("  1. 启动Web应用: ./start.sh 或 python app.py")
-        print("  2. 访问: http://localhost:5000")
-        print("  3. 或使用命令行: python merge_packs.py --help")
+        sys.stdout.write(
+            "\n🎉 所有测试通过！系统已就绪。\n"
+            "\n下一步:\n"
+            "  1. 启动Web应用: ./start.sh 或 python app.py\n"
+            "  2. 访问: http://localhost:5000\n"
+            "  3. 或使用命令行: python merge_packs.py --help\n"
+        )
         return 0
     else:
-        print("\n⚠️  部分测试失败，请检查错误信息。")
+        sys.stdout.write("\n⚠️  部分测试失败，请检查错误信息。\n")
         return 1
 
 if __name__ == '__main__':